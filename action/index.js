@@ -4,6 +4,14 @@ const Scanner = require('../src/scanner');
 const fs = require('fs');
 const path = require('path');
 
+// GitHub annotation level for each issue severity
+const ANNOTATION_LEVELS = {
+  critical: 'error',
+  high: 'error',
+  medium: 'warning',
+  low: 'warning'
+};
+
 async function run() {
   try {
     // Get inputs
@@ -30,14 +38,15 @@ async function run() {
     
     // Set annotations for GitHub
     for (const issue of results.issues) {
+      const level = ANNOTATION_LEVELS[issue.severity] || 'warning';
       const annotation = {
         file: issue.file,
         line: issue.line,
         message: issue.description,
-        severity: issue.severity === 'critical' || issue.severity === 'high' ? 'error' : 'warning'
+        severity: level
       };
       
-      if (issue.severity === 'critical' || issue.severity === 'high') {
+      if (level === 'error') {
         core.error(issue.description, annotation);
       } else {
         core.warning(issue.description, annotation);
@@ -45,7 +54,7 @@ async function run() {
     }
     
     // Fail if critical issues found
-    const criticalCount = results.issues.filter(i => i.severity === 'critical').length;
+    const criticalCount = results.summary.critical;
     if (failOnCritical && criticalCount > 0) {
       core.setFailed(`${criticalCount} critical security issues found`);
     }
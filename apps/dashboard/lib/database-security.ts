@@ -3,6 +3,7 @@
  * Secure database connection and Row Level Security (RLS)
  */
 
+import crypto from 'crypto';
 import { sql } from '@vercel/postgres';
 import { db } from '@/lib/db';
 
@@ -121,7 +122,6 @@ export const databaseSecurity = {
       }
       
       // Implement encryption using crypto module
-      const crypto = require('crypto');
       const algorithm = 'aes-256-gcm';
       const key = crypto.scryptSync(encryptionKey, 'salt', 32);
       const iv = crypto.randomBytes(16);
@@ -141,7 +141,6 @@ export const databaseSecurity = {
         throw new Error('ENCRYPTION_KEY not configured');
       }
       
-      const crypto = require('crypto');
       const algorithm = 'aes-256-gcm';
       const key = crypto.scryptSync(encryptionKey, 'salt', 32);
       
@@ -168,7 +167,7 @@ export const databaseSecurity = {
   audit: {
     logQuery: async (query: string, params: any[], userId: string) => {
       const timestamp = new Date().toISOString();
-      const queryHash = require('crypto').createHash('sha256').update(query).digest('hex');
+      const queryHash = crypto.createHash('sha256').update(query).digest('hex');
       
       await sql`
         INSERT INTO audit_logs (user_id, action, query_hash, timestamp, ip_address)
@@ -6,6 +6,7 @@
 
 const fs = require('fs');
 const path = require('path');
+const { UsageSchema } = require('./schema');
 
 const DB_PATH = process.env.DB_PATH || path.join(process.cwd(), '.data');
 
@@ -143,7 +144,6 @@ class Database {
     
     let usage = data.find(u => u.userId === userId && u.month === month);
     if (!usage) {
-      const { UsageSchema } = require('./schema');
       usage = UsageSchema.create(userId, teamId);
       data.push(usage);
       this.write('usage', data);
@@ -153,12 +153,13 @@ class Database {
 
   incrementUsage(userId, metric, amount = 1) {
     const data = this.read('usage');
-    const month = new Date().toISOString().slice(0, 7);
+    const now = new Date().toISOString();
+    const month = now.slice(0, 7);
     const index = data.findIndex(u => u.userId === userId && u.month === month);
     
     if (index !== -1) {
       data[index][metric] = (data[index][metric] || 0) + amount;
-      data[index].updatedAt = new Date().toISOString();
+      data[index].updatedAt = now;
       this.write('usage', data);
       return data[index];
     }
@@ -6,6 +6,13 @@
 const { PRICING_TIERS } = require('../lib/schema');
 const { getDatabase } = require('../lib/db');
 
+// Usage counter and monthly limit feature for each tracked action
+const USAGE_METRICS = {
+  scan: { metric: 'scansCount', limitKey: 'maxScansPerMonth' },
+  apiCall: { metric: 'apiCalls', limitKey: 'maxApiCallsPerMonth' },
+  report: { metric: 'reportsGenerated', limitKey: 'maxReportsPerMonth' }
+};
+
 class FeatureGate {
   constructor() {
     this.db = getDatabase();
@@ -41,11 +48,7 @@ class FeatureGate {
   canPerform(userId, action, currentCount) {
     const tier = this.getUserTier(userId);
     const features = this.getFeatures(tier);
-    const limit = features[action];
-
-    if (limit === -1) return true; // Unlimited
-    if (limit === undefined) return false; // Feature not available
-    return currentCount < limit;
+    return this.isWithinLimit(features[action], currentCount);
   }
 
   /**
@@ -54,8 +57,22 @@ class FeatureGate {
   getRemainingQuota(userId, action, currentCount) {
     const tier = this.getUserTier(userId);
     const features = this.getFeatures(tier);
-    const limit = features[action];
+    return this.getRemainingForLimit(features[action], currentCount);
+  }
+
+  /**
+   * Check a count against an already-resolved limit
+   */
+  isWithinLimit(limit, currentCount) {
+    if (limit === -1) return true; // Unlimited
+    if (limit === undefined) return false; // Feature not available
+    return currentCount < limit;
+  }
 
+  /**
+   * Get remaining quota for an already-resolved limit
+   */
+  getRemainingForLimit(limit, currentCount) {
     if (limit === -1) return -1; // Unlimited
     if (limit === undefined || limit === false) return 0;
     return Math.max(0, limit - currentCount);
@@ -105,12 +122,12 @@ class FeatureGate {
       }
 
       const currentCount = await getCurrentCount(userId);
-      
-      if (!this.canPerform(userId, action, currentCount)) {
-        const tier = this.getUserTier(userId);
-        const features = this.getFeatures(tier);
-        const limit = features[action];
 
+      // Resolve the tier once; each lookup reads the subscription store
+      const tier = this.getUserTier(userId);
+      const limit = this.getFeatures(tier)[action];
+      
+      if (!this.isWithinLimit(limit, currentCount)) {
         return res.status(429).json({
           error: 'Quota exceeded',
           code: 'QUOTA_EXCEEDED',
@@ -125,9 +142,9 @@ class FeatureGate {
       // Add quota info to request
       req.quota = {
         action,
-        limit: this.getFeatures(this.getUserTier(userId))[action],
+        limit,
         current: currentCount,
-        remaining: this.getRemainingQuota(userId, action, currentCount)
+        remaining: this.getRemainingForLimit(limit, currentCount)
       };
 
       next();
@@ -139,24 +156,21 @@ class FeatureGate {
    */
   async trackAndCheck(userId, action, increment = 1) {
     const usage = this.db.getOrCreateMonthlyUsage(userId);
-    const metricMap = {
-      'scan': 'scansCount',
-      'apiCall': 'apiCalls',
-      'report': 'reportsGenerated'
-    };
-
-    const metric = metricMap[action];
-    if (!metric) return { allowed: true };
+    const tracked = USAGE_METRICS[action];
+    if (!tracked) return { allowed: true };
 
+    const { metric, limitKey } = tracked;
     const currentCount = usage[metric] || 0;
+    const tier = this.getUserTier(userId);
+    const limit = this.getFeatures(tier)[limitKey];
     
-    if (!this.canPerform(userId, `max${action.charAt(0).toUpperCase() + action.slice(1)}sPerMonth`, currentCount)) {
+    if (!this.isWithinLimit(limit, currentCount)) {
       return {
         allowed: false,
         error: 'Quota exceeded',
-        tier: this.getUserTier(userId),
+        tier,
         current: currentCount,
-        limit: this.getFeatures(this.getUserTier(userId))[`max${action.charAt(0).toUpperCase() + action.slice(1)}sPerMonth`]
+        limit
       };
     }
 
@@ -166,7 +180,7 @@ class FeatureGate {
     return {
       allowed: true,
       current: currentCount + increment,
-      remaining: this.getRemainingQuota(userId, `max${action.charAt(0).toUpperCase() + action.slice(1)}sPerMonth`, currentCount + increment)
+      remaining: this.getRemainingForLimit(limit, currentCount + increment)
     };
   }
 }
@@ -11,6 +11,14 @@ const path = require('path');
 const Scanner = require('./scanner');
 const packageJson = require('../package.json');
 
+// Display order, color and heading for each severity level
+const SEVERITY_STYLES = [
+  ['critical', chalk.red.bold, '🔴 Critical Issues:'],
+  ['high', chalk.red, '🟠 High Issues:'],
+  ['medium', chalk.yellow, '🟡 Medium Issues:'],
+  ['low', chalk.blue, '🔵 Low Issues:']
+];
+
 const program = new Command();
 
 program
@@ -36,11 +44,11 @@ program
     try {
       const results = await scanner.scan(scanPath);
       
-      // Display results
-      displayResults(results, options.output);
+      // Drop issues below the minimum severity before formatting anything
+      displayResults(scanner.filterBySeverity(results, options.severity), options.output);
       
       // Exit with error code if critical issues found
-      const criticalCount = results.issues.filter(i => i.severity === 'critical').length;
+      const criticalCount = results.summary.critical;
       if (criticalCount > 0) {
         console.log(chalk.red(`\n❌ ${criticalCount} critical issues found`));
         process.exit(1);
@@ -113,24 +121,11 @@ function displayConsole(results) {
 
   const grouped = groupBySeverity(results.issues);
   
-  if (grouped.critical) {
-    console.log(chalk.red.bold('\n🔴 Critical Issues:'));
-    grouped.critical.forEach(i => printIssue(i));
-  }
-  
-  if (grouped.high) {
-    console.log(chalk.red('\n🟠 High Issues:'));
-    grouped.high.forEach(i => printIssue(i));
-  }
-  
-  if (grouped.medium) {
-    console.log(chalk.yellow('\n🟡 Medium Issues:'));
-    grouped.medium.forEach(i => printIssue(i));
-  }
-  
-  if (grouped.low) {
-    console.log(chalk.blue('\n🔵 Low Issues:'));
-    grouped.low.forEach(i => printIssue(i));
+  for (const [severity, color, heading] of SEVERITY_STYLES) {
+    if (grouped[severity]) {
+      console.log(color(`\n${heading}`));
+      grouped[severity].forEach(i => printIssue(i));
+    }
   }
 
   console.log(chalk.gray(`\nTotal: ${results.issues.length} issues`));
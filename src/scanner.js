@@ -6,13 +6,63 @@
 const fs = require('fs');
 const path = require('path');
 const crypto = require('crypto');
-const { execSync } = require('child_process');
+
+// One-pass union of patterns with identical flags, or null if there is none
+function unionPattern(patterns) {
+  if (patterns.length === 0) {
+    return null;
+  }
+  const flags = patterns[0].flags;
+  if (/[uvgy]/.test(flags) || patterns.some(p => p.flags !== flags)) {
+    return null;
+  }
+  return new RegExp(patterns.map(p => `(?:${p.source})`).join('|'), flags);
+}
+
+// Append files under dir with a wanted extension (any if null) to files
+function walk(dir, wanted, files) {
+  const entries = fs.readdirSync(dir, { withFileTypes: true });
+
+  for (const entry of entries) {
+    if (entry.isDirectory()) {
+      if (!entry.name.startsWith('.') && entry.name !== 'node_modules') {
+        walk(path.join(dir, entry.name), wanted, files);
+      }
+    } else if (entry.isFile()) {
+      if (!wanted || wanted.has(path.extname(entry.name))) {
+        files.push(path.join(dir, entry.name));
+      }
+    }
+  }
+
+  return files;
+}
+
+// Severity rank, most severe first; these are the levels the summary counts
+const SEVERITY_RANK = { critical: 0, high: 1, medium: 2, low: 3 };
+const SEVERITY_LEVELS = new Set(Object.keys(SEVERITY_RANK));
+
+// File types read for YARA rules and for secrets; secrets cover a superset
+const YARA_EXTENSIONS = ['.js', '.ts', '.py', '.json'];
+const SECRET_EXTENSIONS = [...YARA_EXTENSIONS, '.yml', '.yaml', '.env'];
+
+// Hardcoded secret patterns, compiled once at load
+const SECRET_PATTERNS = [
+  { name: 'aws-key', pattern: /AKIA[0-9A-Z]{16}/, severity: 'critical' },
+  { name: 'private-key', pattern: /-----BEGIN (RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----/, severity: 'critical' },
+  { name: 'api-key', pattern: /api[_-]?key["\']?\s*[:=]\s*["\']?[a-zA-Z0-9]{32,}/i, severity: 'high' },
+  { name: 'password', pattern: /password["\']?\s*[:=]\s*["\'][^"\']{8,}/i, severity: 'high' },
+  { name: 'secret', pattern: /secret["\']?\s*[:=]\s*["\'][^"\']{8,}/i, severity: 'high' },
+  { name: 'token', pattern: /token["\']?\s*[:=]\s*["\'][^"\']{16,}/i, severity: 'high' }
+];
 
 class Scanner {
   constructor(options = {}) {
     this.options = options;
     this.rules = this.loadRules();
+    this.anyRule = unionPattern(this.rules.map(rule => rule.pattern));
     this.issues = [];
+    this.fileListing = null;
   }
 
   async scan(scanPath) {
@@ -22,12 +72,16 @@ class Scanner {
       throw new Error(`Path does not exist: ${absolutePath}`);
     }
 
-    // Run all scan modules
-    await this.scanYARA(absolutePath);
-    await this.scanDependencies(absolutePath);
-    await this.scanCodeSigning(absolutePath);
-    await this.scanSecrets(absolutePath);
-    await this.scanPermissions(absolutePath);
+    // Walk the tree once; each scan module filters this listing
+    this.fileListing = this.getFiles(absolutePath);
+    try {
+      await this.scanFiles(absolutePath);
+      await this.scanDependencies(absolutePath);
+      await this.scanCodeSigning(absolutePath);
+      await this.scanPermissions(absolutePath);
+    } finally {
+      this.fileListing = null;
+    }
 
     return {
       timestamp: new Date().toISOString(),
@@ -37,26 +91,62 @@ class Scanner {
     };
   }
 
-  async scanYARA(scanPath) {
-    // YARA pattern matching for malicious code patterns
-    const yaraRules = this.loadYaraRules();
-    
-    const files = this.getFiles(scanPath, ['.js', '.ts', '.py', '.json']);
+  async scanFiles(scanPath) {
+    // Read each file once and run both the YARA rules and the secret patterns on it
+    const files = this.listFiles(scanPath, SECRET_EXTENSIONS);
     
     for (const file of files) {
-      const content = fs.readFileSync(file, 'utf8');
+      const yara = YARA_EXTENSIONS.includes(path.extname(file));
+      const secrets = !file.includes('example') && !file.includes('test');
+      if (!yara && !secrets) {
+        continue;
+      }
       
-      for (const rule of yaraRules) {
-        if (rule.pattern.test(content)) {
-          this.issues.push({
-            rule: rule.name,
-            severity: rule.severity,
-            description: rule.description,
-            file: path.relative(scanPath, file),
-            line: this.findLineNumber(content, rule.pattern),
-            category: 'yara'
-          });
-        }
+      const content = fs.readFileSync(file, 'utf8');
+      if (yara) {
+        this.matchYARA(scanPath, file, content);
+      }
+      if (secrets) {
+        this.matchSecrets(scanPath, file, content);
+      }
+    }
+  }
+
+  matchYARA(scanPath, file, content) {
+    // YARA pattern matching for malicious code patterns
+    if (this.anyRule && !this.anyRule.test(content)) {
+      return;
+    }
+    
+    for (const rule of this.rules) {
+      // A single search both detects the rule and locates it
+      const index = content.search(rule.pattern);
+      if (index !== -1) {
+        this.issues.push({
+          rule: rule.name,
+          severity: rule.severity,
+          description: rule.description,
+          file: path.relative(scanPath, file),
+          line: this.lineAt(content, index),
+          category: 'yara'
+        });
+      }
+    }
+  }
+
+  matchSecrets(scanPath, file, content) {
+    // Scan for hardcoded secrets
+    for (const pattern of SECRET_PATTERNS) {
+      const index = content.search(pattern.pattern);
+      if (index !== -1) {
+        this.issues.push({
+          rule: `secret-${pattern.name}`,
+          severity: pattern.severity,
+          description: `Potential hardcoded secret detected: ${pattern.name}`,
+          file: path.relative(scanPath, file),
+          line: this.lineAt(content, index),
+          category: 'secret'
+        });
       }
     }
   }
@@ -107,40 +197,6 @@ class Scanner {
     }
   }
 
-  async scanSecrets(scanPath) {
-    // Scan for hardcoded secrets
-    const secretPatterns = [
-      { name: 'aws-key', pattern: /AKIA[0-9A-Z]{16}/, severity: 'critical' },
-      { name: 'private-key', pattern: /-----BEGIN (RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----/, severity: 'critical' },
-      { name: 'api-key', pattern: /api[_-]?key["\']?\s*[:=]\s*["\']?[a-zA-Z0-9]{32,}/i, severity: 'high' },
-      { name: 'password', pattern: /password["\']?\s*[:=]\s*["\'][^"\']{8,}/i, severity: 'high' },
-      { name: 'secret', pattern: /secret["\']?\s*[:=]\s*["\'][^"\']{8,}/i, severity: 'high' },
-      { name: 'token', pattern: /token["\']?\s*[:=]\s*["\'][^"\']{16,}/i, severity: 'high' }
-    ];
-
-    const files = this.getFiles(scanPath, ['.js', '.ts', '.py', '.json', '.yml', '.yaml', '.env']);
-    
-    for (const file of files) {
-      const content = fs.readFileSync(file, 'utf8');
-      
-      for (const pattern of secretPatterns) {
-        if (pattern.pattern.test(content)) {
-          // Check if it's in an example/test file
-          if (!file.includes('example') && !file.includes('test')) {
-            this.issues.push({
-              rule: `secret-${pattern.name}`,
-              severity: pattern.severity,
-              description: `Potential hardcoded secret detected: ${pattern.name}`,
-              file: path.relative(scanPath, file),
-              line: this.findLineNumber(content, pattern.pattern),
-              category: 'secret'
-            });
-          }
-        }
-      }
-    }
-  }
-
   async scanPermissions(scanPath) {
     // Check for overly permissive file permissions
     const sensitiveFiles = [
@@ -152,8 +208,9 @@ class Scanner {
 
     for (const filename of sensitiveFiles) {
       const filepath = path.join(scanPath, filename);
-      if (fs.existsSync(filepath)) {
-        const stats = fs.statSync(filepath);
+      // One stat call answers both existence and mode
+      const stats = fs.statSync(filepath, { throwIfNoEntry: false });
+      if (stats) {
         const mode = stats.mode;
         
         // Check if world-readable or world-writable
@@ -239,7 +296,7 @@ class Scanner {
   }
 
   listRules() {
-    return this.loadYaraRules();
+    return this.rules;
   }
 
   async generateSBOM(scanPath) {
@@ -300,35 +357,28 @@ class Scanner {
     return sbom;
   }
 
-  getFiles(dir, extensions) {
-    const files = [];
-    
-    const entries = fs.readdirSync(dir, { withFileTypes: true });
-    
-    for (const entry of entries) {
-      const fullPath = path.join(dir, entry.name);
-      
-      if (entry.isDirectory() && !entry.name.startsWith('.') && entry.name !== 'node_modules') {
-        files.push(...this.getFiles(fullPath, extensions));
-      } else if (entry.isFile()) {
-        const ext = path.extname(entry.name);
-        if (extensions.includes(ext)) {
-          files.push(fullPath);
-        }
-      }
+  listFiles(dir, extensions) {
+    // Outside a scan there is no shared listing, so walk dir directly
+    if (!this.fileListing) {
+      return this.getFiles(dir, extensions);
     }
-    
-    return files;
+
+    const wanted = new Set(extensions);
+    return this.fileListing.filter(file => wanted.has(path.extname(file)));
   }
 
-  findLineNumber(content, pattern) {
-    const lines = content.split('\n');
-    for (let i = 0; i < lines.length; i++) {
-      if (pattern.test(lines[i])) {
-        return i + 1;
-      }
+  getFiles(dir, extensions) {
+    const wanted = extensions ? new Set(extensions) : null;
+    return walk(dir, wanted, []);
+  }
+
+  lineAt(content, index) {
+    // 1-based line of a character offset: count the newlines before it
+    let line = 1;
+    for (let i = content.indexOf('\n'); i !== -1 && i < index; i = content.indexOf('\n', i + 1)) {
+      line++;
     }
-    return 0;
+    return line;
   }
 
   getVulnerablePackages() {
@@ -364,17 +414,29 @@ class Scanner {
     return true; // Placeholder
   }
 
-  generateSummary() {
+  filterBySeverity(results, minSeverity) {
+    // Keep issues at or above minSeverity and recount the summary to match.
+    // Unknown severities are never ranked below the minimum, so they are kept.
+    const minRank = SEVERITY_RANK[minSeverity] ?? SEVERITY_RANK.low;
+    const issues = results.issues.filter(i => !(SEVERITY_RANK[i.severity] > minRank));
+    return { ...results, issues, summary: this.generateSummary(issues) };
+  }
+
+  generateSummary(issues = this.issues) {
     const summary = {
-      total: this.issues.length,
-      critical: this.issues.filter(i => i.severity === 'critical').length,
-      high: this.issues.filter(i => i.severity === 'high').length,
-      medium: this.issues.filter(i => i.severity === 'medium').length,
-      low: this.issues.filter(i => i.severity === 'low').length,
+      total: issues.length,
+      critical: 0,
+      high: 0,
+      medium: 0,
+      low: 0,
       categories: {}
     };
 
-    for (const issue of this.issues) {
+    // Tally severities and categories in a single pass
+    for (const issue of issues) {
+      if (SEVERITY_LEVELS.has(issue.severity)) {
+        summary[issue.severity]++;
+      }
       summary.categories[issue.category] = (summary.categories[issue.category] || 0) + 1;
     }
 